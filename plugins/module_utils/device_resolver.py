@@ -0,0 +1,201 @@
+"""
+Resolve device aliases to LibreNMS device_id.
+https://docs.librenms.org/API/Devices/#list_devices
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible_collections.federstedt.librenms.plugins.module_utils.librenms_api_client import LibreClient
+
+# Fields in a device listing that can be used to identify a device, in resolve priority order.
+ALIAS_FIELDS = ['device_id', 'hostname', 'ip', 'sysName', 'display']
+
+
+class AmbiguousAliasError(Exception):
+    """
+    Alias matches more than one device.
+    """
+    def __init__(self, alias, device_ids)->None:
+        self.alias = alias
+        self.device_ids = device_ids
+        super().__init__(f'Alias {alias} matches multiple devices: {device_ids}')
+
+
+def _normalize(alias) ->str:
+    """
+    Normalize an alias so lookups are case- and whitespace-insensitive.
+
+    Args:
+        alias(str/int): identifier from a device listing or from module params.
+
+    Returns:
+        alias(str): normalized identifier.
+    """
+    return str(alias).strip().lower()
+
+
+def build_device_index(devices) ->dict:
+    """
+    Build an index from every identifier of a device to its device_id.
+
+    Args:
+        devices(list): list of device dicts as returned by the "devices" endpoint.
+
+    Returns:
+        index(dict): {field: {alias: [device_id, ...]}} for every field in ALIAS_FIELDS.
+            Every device_id claiming an alias is kept, so collisions can be detected.
+    """
+    index = {field: {} for field in ALIAS_FIELDS}
+    for device in devices:
+        device_id = device.get('device_id')
+        if device_id is None:
+            continue
+        for field in ALIAS_FIELDS:
+            value = device.get(field)
+            if value is None or value == '':
+                continue
+            device_ids = index[field].setdefault(_normalize(value), [])
+            if device_id not in device_ids:
+                device_ids.append(device_id)
+    return index
+
+
+def resolve_alias(index, alias):
+    """
+    Resolve an alias in an index, checking fields in ALIAS_FIELDS order.
+    The first field that knows the alias decides, so a device_id or hostname
+    always wins over ip, sysName or display name of another device.
+
+    Args:
+        index(dict): index from build_device_index.
+        alias(str): device_id, hostname, ip, sysName or display name.
+
+    Returns:
+        device_id(int): id of the device, or None if no device matches.
+
+    Raises:
+        AmbiguousAliasError: if the alias matches more than one device in the deciding field.
+    """
+    key = _normalize(alias)
+    for field in ALIAS_FIELDS:
+        device_ids = index.get(field, {}).get(key)
+        if not device_ids:
+            continue
+        if len(device_ids) > 1:
+            raise AmbiguousAliasError(alias, device_ids)
+        return device_ids[0]
+    return None
+
+
+class DeviceResolver():
+    """
+    Resolve hostname, IP, sysName or display name to a device_id.
+    The index is built from a single device listing and cached in a file
+    under the temp directory for ttl seconds, so it is shared between module runs.
+    """
+    def __init__(self, api_client: LibreClient, ttl=300)->None:
+        self.api_client = api_client
+        self.ttl = ttl
+
+    @property
+    def cache_path(self) ->str:
+        """
+        Cache file for this api_url and api_token.
+        """
+        key = f'{self.api_client.api_url}\n{self.api_client.api_token}'.encode()
+        digest = hashlib.sha256(key).hexdigest()
+        return os.path.join(tempfile.gettempdir(), f'librenms_device_index_{digest}.json')
+
+    def _read_cache(self):
+        """
+        Read index from the cache file.
+        Symlinks and files owned by other users are ignored.
+
+        Returns:
+            index(dict): cached index, or None if missing, unreadable, not ours or older than ttl.
+        """
+        try:
+            fd = os.open(self.cache_path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+            with os.fdopen(fd, encoding='utf-8') as cache_file:
+                if os.fstat(cache_file.fileno()).st_uid != os.getuid():
+                    return None
+                cached = json.load(cache_file)
+            if time.time() - cached['timestamp'] < self.ttl:
+                return cached['index']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _write_cache(self, index) ->None:
+        """
+        Write index to the cache file, readable by the current user only.
+        A failed write only means the next run lists devices again.
+
+        Args:
+            index(dict): index from build_device_index.
+        """
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix='librenms_device_index_', suffix='.tmp', dir=os.path.dirname(self.cache_path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+                json.dump({'timestamp': time.time(), 'index': index}, cache_file)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def invalidate(self) ->None:
+        """
+        Remove the cache file, call after adding or deleting a device.
+        """
+        try:
+            os.remove(self.cache_path)
+        except OSError:
+            pass
+
+    def get_index(self, refresh=False) ->dict:
+        """
+        Get the alias index, listing devices from the API if the cache is stale.
+
+        Args:
+            refresh(bool): ignore the cached index and list devices again.
+
+        Returns:
+            index(dict): index from build_device_index.
+        """
+        if not refresh:
+            index = self._read_cache()
+            if index is not None:
+                return index
+
+        response = self.api_client.get(endpoint='devices')
+        index = build_device_index(response.get('devices', []))
+        self._write_cache(index)
+        return index
+
+    def resolve(self, alias, refresh=False):
+        """
+        Resolve an alias to a device_id.
+        A plain numeric alias is taken as the device_id without listing devices.
+
+        Args:
+            alias(str): device_id, hostname, ip, sysName or display name.
+            refresh(bool): ignore the cached index and list devices again.
+
+        Returns:
+            device_id(int): id of the device, or None if no device matches.
+
+        Raises:
+            AmbiguousAliasError: if the alias matches more than one device.
+        """
+        alias_str = str(alias).strip()
+        if alias_str.isascii() and alias_str.isdecimal():
+            return int(alias_str)
+        return resolve_alias(self.get_index(refresh=refresh), alias)
@@ -0,0 +1,157 @@
+"""
+Opt-in profiling of module runs.
+Enable with the module option profile: true or the environment variable LIBRENMS_PROFILE=1.
+Writes a pstats file (readable by pstats, snakeviz or flameprof) and
+returns a short summary with timing spans and peak memory.
+"""
+import cProfile
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = 'LIBRENMS_PROFILE'
+PROFILE_PATH_ENV = 'LIBRENMS_PROFILE_PATH'
+
+# Profiler of the current module run, None when profiling is disabled.
+_ACTIVE = None
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block as a named span on the active profiler, no-op if profiling is disabled.
+
+    Args:
+        name(str): span name, for example 'invoke' or 'decode'.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_span(name, time.perf_counter() - start)
+
+
+class ModuleProfiler():
+    """
+    Wraps a module run in cProfile and tracemalloc.
+    Used as a context manager, does nothing when not enabled.
+    """
+    def __init__(self, enabled=False, output_path=None, top_n=10)->None:
+        self.enabled = enabled
+        self.output_path = output_path
+        self.top_n = top_n
+        self.spans = {}
+        self.peak_memory = 0
+        self.error = None
+        self._profile = None
+        self._started_tracemalloc = False
+        self._stats = None
+
+    @classmethod
+    def from_params(cls, params, module_name):
+        """
+        Create profiler from module params and environment.
+
+        Args:
+            params(AnsibleModule.params): params with profile and profile_path.
+            module_name(str): used in the default output filename.
+
+        Returns:
+            profiler(ModuleProfiler): enabled if requested by params or environment.
+        """
+        enabled = bool(params.get('profile')) or os.environ.get(PROFILE_ENV, '').lower() in ['1', 'true', 'yes']
+        output_path = params.get('profile_path') or os.environ.get(PROFILE_PATH_ENV)
+        if enabled and not output_path:
+            output_path = os.path.join(tempfile.gettempdir(), f'{module_name}-{os.getpid()}.pstats')
+        return cls(enabled=enabled, output_path=output_path)
+
+    def add_span(self, name, seconds) ->None:
+        """
+        Add timing of one span occurrence.
+
+        Args:
+            name(str): span name.
+            seconds(float): elapsed time.
+        """
+        entry = self.spans.setdefault(name, {'count': 0, 'seconds': 0.0})
+        entry['count'] += 1
+        entry['seconds'] += seconds
+
+    def __enter__(self):
+        global _ACTIVE
+        if self.enabled:
+            _ACTIVE = self
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            elif hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+                tracemalloc.reset_peak()
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+                self._profile = profile
+            except ValueError as exc:  # another profiler is active (Python 3.12+), keep spans and memory only.
+                self.error = f'cProfile not available: {exc}'
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _ACTIVE
+        if not self.enabled:
+            return False
+        if self._profile is not None:
+            self._profile.disable()
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        _ACTIVE = None
+        if self._profile is None:
+            self.output_path = None
+            return False
+        try:
+            self._profile.dump_stats(self.output_path)
+        except OSError as exc:  # profiling must never change the module outcome.
+            self.error = f'Failed to write {self.output_path}: {exc}'
+            self.output_path = None
+        self._stats = pstats.Stats(self._profile)
+        return False
+
+    def summary(self) ->dict:
+        """
+        Summarize the profiled run.
+
+        Returns:
+            summary(dict): stats_file, peak_memory_bytes, spans and the
+                top_n functions sorted by cumulative time. stats_file is None
+                and error is set if cProfile could not be started or the
+                pstats file could not be written.
+        """
+        top = []
+        if self._stats is not None:
+            self._stats.sort_stats('cumulative')
+            for func in self._stats.fcn_list[:self.top_n]:
+                _, ncalls, tottime, cumtime, _ = self._stats.stats[func]
+                filename, line, function = func
+                top.append({
+                    'function': f'{filename}:{line}({function})',
+                    'ncalls': ncalls,
+                    'tottime': round(tottime, 6),
+                    'cumtime': round(cumtime, 6),
+                })
+        spans = {name: {'count': entry['count'], 'seconds': round(entry['seconds'], 6)}
+                 for name, entry in self.spans.items()}
+        summary = {
+            'stats_file': self.output_path,
+            'peak_memory_bytes': self.peak_memory,
+            'spans': spans,
+            'top': top,
+        }
+        if self.error:
+            summary['error'] = self.error
+        return summary
@@ -3,6 +3,8 @@ Common utils used by libreNMS modules.
 """
 import json
 
+from ansible_collections.federstedt.librenms.plugins.module_utils.libre_profiler import span
+
 def get_required_args(state):
     """
     Map required arguments to state.
@@ -85,10 +87,11 @@ def parse_ansible_listdict(data)->dict:
         formated_data(dict): a dict of key value pairs.
     """
     formated_dict = {}
-    for entry in data:
-        entry = entry.replace("'", '"')
-        entry_dict = json.loads(entry)
-        for key, value in entry_dict.items():
-            formated_dict[key] = value
+    with span('parse'):
+        for entry in data:
+            entry = entry.replace("'", '"')
+            entry_dict = json.loads(entry)
+            for key, value in entry_dict.items():
+                formated_dict[key] = value
 
     return formated_dict
@@ -4,6 +4,8 @@ https://docs.librenms.org/API/Devices/#endpoint-categories
 """
 import requests
 
+from ansible_collections.federstedt.librenms.plugins.module_utils.libre_profiler import span
+
 class LibreAPIError(Exception):
     """
     Exception encountered talking to API.
@@ -44,9 +46,10 @@ class LibreClient():
             if json_data:
                 headers["Content-Type"] = "application/json"
 
-            response = self.session.request(
-                method=method,url=url,headers=headers,
-                json=json_data, verify=self.ssl_verify, params=params)
+            with span('invoke'):
+                response = self.session.request(
+                    method=method,url=url,headers=headers,
+                    json=json_data, verify=self.ssl_verify, params=params)
             response.raise_for_status()
         except requests.exceptions.Timeout as exc:
             raise LibreAPIError(408, "The request has timed out") from exc
@@ -69,7 +72,8 @@ class LibreClient():
         if response.status_code != 200:
             raise LibreAPIError(status_code=response.status_code,
                                 details=f'Failed to get {endpoint} from LibreNMS API.\n{response.json["message"]}')
-        json_resp = response.json()
+        with span('decode'):
+            json_resp = response.json()
         return json_resp
 
     def post(self, endpoint, data) -> dict:
@@ -93,7 +97,8 @@ class LibreClient():
             else:
                 # this happens if data already exists
                 pass
-        json_resp = response.json()
+        with span('decode'):
+            json_resp = response.json()
         return json_resp
 
     def delete(self, endpoint, data=None) ->dict:
@@ -112,5 +117,6 @@ class LibreClient():
             raise LibreAPIError(response.status_code,
                                 details=f'Failed to DELETE at {endpoint}.\n{response.json["message"]}'
                                 )
-        json_resp = response.json()
+        with span('decode'):
+            json_resp = response.json()
         return json_resp
@@ -39,6 +39,11 @@ options:
         desciption: Device hostname either ip-address or FQDN (localhost.localdomain) when adding. When doing get or delete: hostname can be either the device hostname or id.
         required: true, when adding or removing device, optional for get (if empty on get, returns all devices).
         type: str
+    resolve_alias:
+        description: When removing, resolve name as device_id, hostname, ip, sysName or display name (in that priority) to the device_id before calling the API. Fails if the name matches more than one device. Devices are always listed again before removing.
+        required: false
+        default: true
+        type: bool
     display: 
         description: A string to display as the name of this device
         required: false
@@ -114,6 +119,15 @@ options:
         desciption: Device hardware. (ICMP only)
         required: false
         type: str
+    profile:
+        description: Profile the module run with cProfile and tracemalloc. Writes a pstats file and returns a summary under profile. Can also be enabled with the environment variable LIBRENMS_PROFILE=1.
+        required: false
+        default: false
+        type: bool
+    profile_path:
+        description: Where to write the pstats file when profiling. Defaults to LIBRENMS_PROFILE_PATH or a file in the temp directory.
+        required: false
+        type: str
     query_params:
         description:
                 - List of parameters passed to the query. Se examples: https://docs.librenms.org/API/Devices/#list_devices
@@ -149,6 +163,11 @@ tasks:
     state: absent
     name: "192.168.1.1"
 
+- name: Delete a device by its sysName
+  libre_devices:
+    state: absent
+    name: "switch1.example.com"
+
 Example of how to use query filter.
 Complete Syntax can be found at librenms API docu: https://docs.librenms.org/API/Devices/#list_devices
 
@@ -172,15 +191,20 @@ RETURN = r"""
 data:
     description: The data returned by the request.
     returned: On success
+profile:
+    description: Profiling summary with stats_file, peak_memory_bytes, timing spans (invoke, decode, parse, serialize) and the top functions by cumulative time.
+    returned: When profiling is enabled
 """
 
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, remove_values
 from ansible_collections.federstedt.librenms.plugins.module_utils.librenms_api_client import LibreClient, LibreAPIError
 from ansible_collections.federstedt.librenms.plugins.module_utils.libre_utils import (
     get_required_args,
     validate_args,
     parse_json,
 )
+from ansible_collections.federstedt.librenms.plugins.module_utils.device_resolver import DeviceResolver
+from ansible_collections.federstedt.librenms.plugins.module_utils.libre_profiler import ModuleProfiler, span
 
 
 # define available arguments/parameters a user can pass to the module
@@ -192,6 +216,7 @@ module_args = {
     "ssl_verify": {"type": "bool", "required": False},
     # Argumens for adding a device
     "name": {"type": "str", "required": False, "aliases": ["hostname"]},
+    "resolve_alias": {"type": "bool", "required": False, "default": True},
     "display": {"type": "str", "required": False},
     "port": {"type": "int", "required": False},
     "transport": {"type": "str", "required": False},
@@ -212,6 +237,9 @@ module_args = {
     "os": {"type": "str", "required": False},
     "sysName": {"type": "str", "required": False},
     "hardware": {"type": "str", "required": False},
+    # Arguments for profiling
+    "profile": {"type": "bool", "required": False, "default": False},
+    "profile_path": {"type": "str", "required": False},
 }
 
 module = AnsibleModule(argument_spec=module_args)
@@ -237,7 +265,16 @@ def device_delete(params) -> dict:
             ssl_verify=params["ssl_verify"],
         )
 
+        resolver = DeviceResolver(api_client)
+        if params["resolve_alias"]:
+            # never delete from the cached index, it may point an alias to the wrong device.
+            device_id = resolver.resolve(hostname, refresh=True)
+            if device_id is None:  # no device has this alias, it is absent already.
+                return {"changed": False, "data": f"Device {hostname} not found"}
+            hostname = device_id
+
         response = api_client.delete(endpoint=f"devices/{hostname}")
+        resolver.invalidate()
         return {"changed": True, "data": response}
 
     except LibreAPIError as exc:
@@ -272,6 +309,7 @@ def device_add(params) -> dict:
         json_data = parse_json(params=params)
 
         response = api_client.post(endpoint="devices", data=json_data)
+        DeviceResolver(api_client).invalidate()
 
         return {"changed": True, "data": response}
 
@@ -297,16 +335,27 @@ def run_module():
             msg=f"Required argument(s) missing for state={module.params['state']}, requires: {get_required_args(module.params['state'])}"
         )
 
+    profiler = ModuleProfiler.from_params(module.params, module_name="libre_devices")
     try:
-        if module.params["state"] == "present":
-            response = device_add(module.params)
-        elif module.params["state"] == "absent":
-            response = device_delete(module.params)
-        else:
-            module.fail_json(msg=f"Invalid state provided: {module.params['state']}")
-
+        with profiler:
+            if module.params["state"] == "present":
+                response = device_add(module.params)
+            elif module.params["state"] == "absent":
+                response = device_delete(module.params)
+            else:
+                module.fail_json(msg=f"Invalid state provided: {module.params['state']}")
+
+            if profiler.enabled:
+                # no_log sanitization and JSON encoding as done by exit_json.
+                with span("serialize"):
+                    module.jsonify(remove_values(response, module.no_log_values))
+
+        if profiler.enabled:
+            response["profile"] = profiler.summary()
         module.exit_json(**response)
     except Exception as exc:
+        if profiler.enabled:  # failed runs are often the slow ones, keep the profile.
+            module.fail_json(msg=str(exc), profile=profiler.summary())
         module.fail_json(msg=str(exc))
 
 
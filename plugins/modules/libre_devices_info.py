@@ -29,12 +29,31 @@ options:
         required: false
         default: false
         type: bool
+    name:
+        aliases: hostname
+        description: Device to get, can be device_id, hostname, ip, sysName or display name. If empty, returns all devices.
+        required: false
+        type: str
+    resolve_alias:
+        description: Resolve name as device_id, hostname, ip, sysName or display name (in that priority) to the device_id before calling the API. Fails if the name matches more than one device. The device index is cached in the temp directory for 5 minutes.
+        required: false
+        default: true
+        type: bool
     query_params:
         description:
                 - List of parameters passed to the query. Se examples: https://docs.librenms.org/API/Devices/#list_devices
         type: list
         elements: str
         default: []
+    profile:
+        description: Profile the module run with cProfile and tracemalloc. Writes a pstats file and returns a summary under profile. Can also be enabled with the environment variable LIBRENMS_PROFILE=1.
+        required: false
+        default: false
+        type: bool
+    profile_path:
+        description: Where to write the pstats file when profiling. Defaults to LIBRENMS_PROFILE_PATH or a file in the temp directory.
+        required: false
+        type: str
 
 # Specify this value according to your collection
 # in format of namespace.collection.doc_fragment_name
@@ -74,15 +93,20 @@ RETURN = r'''
 data:
     description: The data returned by the request.
     returned: On success
+profile:
+    description: Profiling summary with stats_file, peak_memory_bytes, timing spans (invoke, decode, parse, serialize) and the top functions by cumulative time.
+    returned: When profiling is enabled
 '''
 
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, remove_values
 from ansible_collections.federstedt.librenms.plugins.module_utils.librenms_api_client import LibreClient, LibreAPIError
 from ansible_collections.federstedt.librenms.plugins.module_utils.libre_utils import (
     get_required_args,
     validate_args,
     parse_ansible_listdict
 )
+from ansible_collections.federstedt.librenms.plugins.module_utils.device_resolver import DeviceResolver
+from ansible_collections.federstedt.librenms.plugins.module_utils.libre_profiler import ModuleProfiler, span
 
 # define available arguments/parameters a user can pass to the module
 module_args = {
@@ -92,7 +116,12 @@ module_args = {
 
         # Arguments for getting a device
         "name": {"type": "str", "required": False, "aliases": ["hostname"]},
-        "query_params": {"type": "list", "elements": "str", "default": []}
+        "resolve_alias": {"type": "bool", "required": False, "default": True},
+        "query_params": {"type": "list", "elements": "str", "default": []},
+
+        # Arguments for profiling
+        "profile": {"type": "bool", "required": False, "default": False},
+        "profile_path": {"type": "str", "required": False}
     }
 
 module = AnsibleModule(argument_spec=module_args)
@@ -111,11 +140,6 @@ def device_get(params) ->dict:
             changed: False (since this is a get request),
             data: response(json_response from api_client).
     """
-    if params['name']:
-        endpoint = 'devices/' + params['name']
-    else:
-        endpoint = 'devices'
-
     if params['query_params']:
         query_params = parse_ansible_listdict(params['query_params'])
     else:
@@ -125,6 +149,20 @@ def device_get(params) ->dict:
         api_client = LibreClient(
             api_url=params['api_url'], api_token=params['api_token'],
             ssl_verify=params['ssl_verify'])
+
+        if params['name']:
+            device = params['name']
+            if params['resolve_alias']:
+                resolver = DeviceResolver(api_client)
+                device_id = resolver.resolve(device)
+                if device_id is None:  # cached index may be stale, list devices again.
+                    device_id = resolver.resolve(device, refresh=True)
+                if device_id is not None:  # unknown aliases are passed on, the API reports them.
+                    device = device_id
+            endpoint = f'devices/{device}'
+        else:
+            endpoint = 'devices'
+
         response = api_client.get(endpoint=endpoint, params=query_params)
         return {"changed": False, "data" : response}
     except LibreAPIError as exc:
@@ -143,11 +181,22 @@ def run_module():
             msg=f"Required argument(s) missing requires: {get_required_args(module.params['state'])}")
 
 
+    profiler = ModuleProfiler.from_params(module.params, module_name='libre_devices_info')
     try:
-        response = device_get(module.params)
+        with profiler:
+            response = device_get(module.params)
+
+            if profiler.enabled:
+                # no_log sanitization and JSON encoding as done by exit_json.
+                with span('serialize'):
+                    module.jsonify(remove_values(response, module.no_log_values))
 
+        if profiler.enabled:
+            response['profile'] = profiler.summary()
         module.exit_json(**response)
     except Exception as exc:
+        if profiler.enabled:  # failed runs are often the slow ones, keep the profile.
+            module.fail_json(msg=str(exc), profile=profiler.summary())
         module.fail_json(msg=str(exc))
 
 def main():
@@ -0,0 +1,139 @@
+"""
+Unit tests for device_resolver.
+"""
+import os
+
+import pytest
+
+from ansible_collections.federstedt.librenms.plugins.module_utils.device_resolver import (
+    AmbiguousAliasError,
+    DeviceResolver,
+    build_device_index,
+    resolve_alias,
+)
+
+
+class FakeClient():
+    """
+    Stand-in for LibreClient returning a fixed device listing.
+    """
+    def __init__(self, devices)->None:
+        self.api_url = 'https://librenms.example.com'
+        self.api_token = 'token'
+        self.devices = devices
+        self.calls = 0
+
+    def get(self, endpoint, params=None) ->dict:
+        self.calls += 1
+        return {'status': 'ok', 'devices': self.devices}
+
+
+@pytest.fixture(name='tmp_cache')
+def fixture_tmp_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    return tmp_path
+
+
+def test_device_id_wins_over_hostname_of_other_device():
+    index = build_device_index([
+        {'device_id': 3, 'hostname': '12'},
+        {'device_id': 12, 'hostname': 'switch12'},
+    ])
+    assert resolve_alias(index, '12') == 12
+
+
+def test_hostname_wins_over_ip_sysname_and_display():
+    index = build_device_index([
+        {'device_id': 1, 'hostname': 'core', 'ip': '10.0.0.1'},
+        {'device_id': 2, 'hostname': 'edge', 'ip': '10.0.0.2', 'sysName': 'core', 'display': 'core'},
+    ])
+    assert resolve_alias(index, 'core') == 1
+    assert resolve_alias(index, '10.0.0.2') == 2
+
+
+def test_alias_is_case_insensitive():
+    index = build_device_index([{'device_id': 1, 'hostname': 'Core.Example.com'}])
+    assert resolve_alias(index, ' core.example.COM ') == 1
+
+
+def test_colliding_display_name_is_ambiguous():
+    index = build_device_index([
+        {'device_id': 1, 'hostname': 'a', 'display': 'core'},
+        {'device_id': 2, 'hostname': 'b', 'display': 'Core'},
+    ])
+    with pytest.raises(AmbiguousAliasError) as exc:
+        resolve_alias(index, 'core')
+    assert exc.value.device_ids == [1, 2]
+
+
+def test_same_device_in_several_fields_is_not_ambiguous():
+    index = build_device_index([{'device_id': 1, 'hostname': 'core', 'sysName': 'core', 'display': 'core'}])
+    assert resolve_alias(index, 'core') == 1
+
+
+def test_unknown_alias_resolves_to_none():
+    index = build_device_index([{'device_id': 1, 'hostname': 'core'}])
+    assert resolve_alias(index, 'missing') is None
+
+
+def test_numeric_alias_skips_listing(tmp_cache):
+    client = FakeClient([])
+    assert DeviceResolver(client).resolve('42') == 42
+    assert client.calls == 0
+
+
+def test_index_is_cached_between_resolvers(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    assert DeviceResolver(client).resolve('core') == 1
+    assert DeviceResolver(client).resolve('core') == 1
+    assert client.calls == 1
+
+
+def test_refresh_finds_device_added_after_caching(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    resolver = DeviceResolver(client)
+    assert resolver.resolve('edge') is None
+    client.devices.append({'device_id': 2, 'hostname': 'edge'})
+    assert resolver.resolve('edge') is None
+    assert resolver.resolve('edge', refresh=True) == 2
+    assert client.calls == 2
+
+
+def test_expired_cache_lists_devices_again(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    DeviceResolver(client, ttl=0).resolve('core')
+    DeviceResolver(client, ttl=0).resolve('core')
+    assert client.calls == 2
+
+
+def test_unicode_digit_alias_uses_index(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': '²'}])
+    assert DeviceResolver(client).resolve('²') == 1
+
+
+def test_invalidate_removes_cache(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    resolver = DeviceResolver(client)
+    resolver.resolve('core')
+    resolver.invalidate()
+    resolver.resolve('core')
+    assert client.calls == 2
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid') or os.getuid() != 0, reason='needs root to chown')
+def test_cache_owned_by_other_user_is_ignored(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    resolver = DeviceResolver(client)
+    resolver.resolve('core')
+    os.chown(resolver.cache_path, 12345, -1)
+    assert resolver._read_cache() is None
+
+
+def test_cache_symlink_is_ignored(tmp_cache):
+    client = FakeClient([{'device_id': 1, 'hostname': 'core'}])
+    resolver = DeviceResolver(client)
+    resolver.resolve('core')
+    target = tmp_cache / 'target.json'
+    os.replace(resolver.cache_path, target)
+    os.symlink(target, resolver.cache_path)
+    assert resolver._read_cache() is None
@@ -0,0 +1,67 @@
+"""
+Unit tests for libre_profiler.
+"""
+import tracemalloc
+
+from ansible_collections.federstedt.librenms.plugins.module_utils import libre_profiler
+from ansible_collections.federstedt.librenms.plugins.module_utils.libre_profiler import ModuleProfiler, span
+
+
+def test_spans_and_stats_file_are_recorded(tmp_path):
+    output_path = tmp_path / 'run.pstats'
+    with ModuleProfiler(enabled=True, output_path=str(output_path)) as profiler:
+        with span('invoke'):
+            sum(range(100))
+    summary = profiler.summary()
+    assert output_path.exists()
+    assert summary['stats_file'] == str(output_path)
+    assert summary['spans']['invoke']['count'] == 1
+    assert 'error' not in summary
+
+
+def test_span_is_noop_when_disabled():
+    with ModuleProfiler(enabled=False) as profiler:
+        with span('invoke'):
+            pass
+    assert not profiler.spans
+
+
+def test_unwritable_stats_file_is_reported_not_raised(tmp_path):
+    output_path = tmp_path / 'missing' / 'run.pstats'
+    with ModuleProfiler(enabled=True, output_path=str(output_path)) as profiler:
+        sum(range(100))
+    summary = profiler.summary()
+    assert summary['stats_file'] is None
+    assert str(output_path) in summary['error']
+
+
+def test_tracemalloc_started_elsewhere_keeps_running(tmp_path):
+    tracemalloc.start()
+    try:
+        with ModuleProfiler(enabled=True, output_path=str(tmp_path / 'run.pstats')):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_tracemalloc_started_by_profiler_is_stopped(tmp_path):
+    with ModuleProfiler(enabled=True, output_path=str(tmp_path / 'run.pstats')):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_active_profiler_is_reported_not_raised(monkeypatch, tmp_path):
+    class BusyProfile():
+        def enable(self):
+            raise ValueError('Another profiling tool is already active')
+
+    monkeypatch.setattr(libre_profiler.cProfile, 'Profile', BusyProfile)
+    with ModuleProfiler(enabled=True, output_path=str(tmp_path / 'run.pstats')) as profiler:
+        with span('invoke'):
+            pass
+    summary = profiler.summary()
+    assert summary['stats_file'] is None
+    assert 'already active' in summary['error']
+    assert summary['spans']['invoke']['count'] == 1
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the libre_devices module.
+"""
+import json
+
+import pytest
+from ansible.module_utils import basic
+
+from ansible_collections.federstedt.librenms.plugins.module_utils.device_resolver import DeviceResolver
+
+MODULE_ARGS = {
+    'state': 'absent',
+    'api_url': 'https://librenms.example.com',
+    'api_token': 'token',
+    'name': '10.0.0.5',
+}
+
+# AnsibleModule is created when the module is imported, so it needs args first.
+basic._ANSIBLE_ARGS = json.dumps({'ANSIBLE_MODULE_ARGS': MODULE_ARGS}).encode()
+basic._ANSIBLE_PROFILE = 'legacy'
+
+from ansible_collections.federstedt.librenms.plugins.modules import libre_devices  # noqa: E402
+
+
+class FakeClient():
+    """
+    Stand-in for LibreClient with a device listing shared by all instances.
+    """
+    devices = []
+    deleted = []
+
+    def __init__(self, api_url, api_token, ssl_verify=False)->None:
+        self.api_url = api_url
+        self.api_token = api_token
+
+    def get(self, endpoint, params=None) ->dict:
+        return {'status': 'ok', 'devices': FakeClient.devices}
+
+    def delete(self, endpoint, data=None) ->dict:
+        FakeClient.deleted.append(endpoint)
+        return {'status': 'ok'}
+
+    def post(self, endpoint, data) ->dict:
+        return {'status': 'ok'}
+
+
+@pytest.fixture(name='client')
+def fixture_client(monkeypatch, tmp_path):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    monkeypatch.setattr(libre_devices, 'LibreClient', FakeClient)
+    FakeClient.devices = []
+    FakeClient.deleted = []
+    return FakeClient(MODULE_ARGS['api_url'], MODULE_ARGS['api_token'])
+
+
+def delete_params(name):
+    params = dict(MODULE_ARGS, name=name, ssl_verify=False, resolve_alias=True)
+    return params
+
+
+def test_delete_ignores_stale_cache(client):
+    FakeClient.devices = [{'device_id': 7, 'hostname': 'old', 'ip': '10.0.0.5'}]
+    assert DeviceResolver(client).resolve('10.0.0.5') == 7
+    FakeClient.devices = [
+        {'device_id': 7, 'hostname': 'old', 'ip': '10.0.0.6'},
+        {'device_id': 9, 'hostname': 'new', 'ip': '10.0.0.5'},
+    ]
+
+    result = libre_devices.device_delete(delete_params('10.0.0.5'))
+
+    assert result['changed'] is True
+    assert FakeClient.deleted == ['devices/9']
+
+
+def test_delete_invalidates_cache(client):
+    FakeClient.devices = [{'device_id': 7, 'hostname': 'old'}]
+    resolver = DeviceResolver(client)
+
+    libre_devices.device_delete(delete_params('old'))
+
+    assert FakeClient.deleted == ['devices/7']
+    assert resolver._read_cache() is None
+
+
+def test_delete_unknown_alias_is_absent(client):
+    FakeClient.devices = [{'device_id': 7, 'hostname': 'old'}]
+
+    result = libre_devices.device_delete(delete_params('missing'))
+
+    assert result['changed'] is False
+    assert not FakeClient.deleted
+
+
+class FailJson(Exception):
+    """
+    Raised instead of exiting from fail_json.
+    """
+
+
+def test_failed_run_returns_profile(client, monkeypatch, tmp_path):
+    def fail_json(**kwargs):
+        raise FailJson(kwargs)
+
+    def device_delete(params):
+        raise Exception('timed out')
+
+    monkeypatch.setattr(libre_devices.module, 'fail_json', fail_json)
+    monkeypatch.setattr(libre_devices, 'device_delete', device_delete)
+    monkeypatch.setitem(libre_devices.module.params, 'profile', True)
+    monkeypatch.setitem(libre_devices.module.params, 'profile_path', str(tmp_path / 'run.pstats'))
+
+    with pytest.raises(FailJson) as exc:
+        libre_devices.run_module()
+
+    result = exc.value.args[0]
+    assert result['msg'] == 'timed out'
+    assert result['profile']['stats_file'] == str(tmp_path / 'run.pstats')